@@ -298,6 +298,97 @@ class FlatAdjacencyList:
             yield (idx, self[idx])
 
 
+class NeighbourAdjacencyList:
+    """
+    Stores the neighbouring nodes of every node, and the weights of the corresponding edges, in
+    contiguous numpy arrays. The bounds of each node's slice are stored as a separate ``starts``
+    and ``lengths`` array, so that the hot loops of a random walk can find the degree and the first
+    neighbour of a node with one lookup each.
+
+    Args:
+        neighbours (numpy.ndarray): the ilocs of the neighbours of every node, concatenated
+        weights (numpy.ndarray): the weight of the edge to each element of ``neighbours``
+        splits (numpy.ndarray): the boundaries between nodes in ``neighbours``, as with
+            :class:`FlatAdjacencyList`
+    """
+
+    def __init__(self, neighbours, weights, splits):
+        # the slices for each node are views into these arrays, which are shared by every caller, so
+        # they're read-only to stop any one of them from modifying the graph
+        neighbours.flags.writeable = False
+        weights.flags.writeable = False
+
+        self.neighbours = neighbours
+        self.weights = weights
+        # the smallest signed type that holds every neighbour, and the -1 sentinel used for "no
+        # neighbour" by samplers
+        self.sample_dtype = np.promote_types(neighbours.dtype, np.int8)
+        self.splits = splits
+        self.starts = splits[:-1]
+        self.lengths = np.diff(splits)
+        self._cumulative_weights = None
+        self._sorted_by_weight = None
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            raise KeyError("node ilocs must be non-negative.")
+        start = self.starts[idx]
+        return self.neighbours[start : start + self.lengths[idx]]
+
+    def weights_of(self, idx):
+        """
+        The weights of the edges to the neighbours of the node with iloc ``idx``, in the same order
+        as ``self[idx]``.
+        """
+        if idx < 0:
+            raise KeyError("node ilocs must be non-negative.")
+        start = self.starts[idx]
+        return self.weights[start : start + self.lengths[idx]]
+
+    def cumulative_weights(self):
+        """
+        The running total of the weights within each node's slice, that is, element ``j`` of node
+        ``i``'s slice is the sum of its first ``j + 1`` weights. This is computed once and then
+        cached.
+        """
+        if self._cumulative_weights is None:
+            cumulative = np.empty_like(self.weights)
+            # nodes with the same degree can have their sums computed together as a 2D array, and
+            # there's typically far fewer distinct degrees than nodes; sorting the nodes by degree
+            # once makes each degree's group a contiguous slice, rather than a scan over every node
+            order = np.argsort(self.lengths, kind="stable")
+            sorted_lengths = self.lengths[order]
+            degrees, group_starts = np.unique(sorted_lengths, return_index=True)
+            group_ends = np.append(group_starts[1:], len(order))
+            for degree, begin, end in zip(degrees, group_starts, group_ends):
+                if degree == 0:
+                    continue
+                starts = self.starts[order[begin:end]]
+                idx = starts[:, None] + np.arange(degree)
+                cumulative[idx] = np.cumsum(self.weights[idx], axis=1)
+
+            cumulative.flags.writeable = False
+            self._cumulative_weights = cumulative
+
+        return self._cumulative_weights
+
+    def sorted_by_weight(self):
+        """
+        The same neighbours, with each node's slice sorted by ascending weight (for instance, by
+        time, for a temporal graph), so that the neighbours with weights in a range can be found by
+        binary search. This is computed once and then cached.
+        """
+        if self._sorted_by_weight is None:
+            owners = np.repeat(np.arange(len(self.lengths)), self.lengths)
+            # sort by owner first, so that each node's neighbours stay in its own slice
+            order = np.lexsort((self.weights, owners))
+            self._sorted_by_weight = NeighbourAdjacencyList(
+                self.neighbours[order], self.weights[order], self.splits
+            )
+
+        return self._sorted_by_weight
+
+
 class EdgeData(ElementData):
     """
     Args:
@@ -340,6 +431,9 @@ class EdgeData(ElementData):
         # These are lazily initialized, to only pay the (construction) time and memory cost when
         # actually using them
         self._edges_dict = self._edges_in_dict = self._edges_out_dict = None
+        self._neighbours_dicts = {}
+        self._invalid_weight_ilocs = None
+        self._weights_are_uniform = None
 
         # when there's no neighbors for something, an empty array should be returned; this uses a
         # tiny dtype to minimise unnecessary type promotion (e.g. if this is used with an int32
@@ -422,6 +516,66 @@ class EdgeData(ElementData):
             "expected at least one of 'ins' or 'outs' to be True, found neither"
         )
 
+    def neighbour_lookup(self, *, ins, outs) -> NeighbourAdjacencyList:
+        """
+        Return the neighbouring node ilocs (and edge weights) of every node, following incoming
+        and/or outgoing edges. This is computed once and then cached.
+
+        Args:
+            ins (bool): follow incoming edges
+            outs (bool): follow outgoing edges
+
+        Returns:
+            A :class:`NeighbourAdjacencyList` indexed by node iloc.
+        """
+        key = (ins, outs)
+        neighbours_dict = self._neighbours_dicts.get(key)
+        if neighbours_dict is None:
+            adj = self._adj_lookup(ins=ins, outs=outs)
+            sources = self.sources[adj.flat]
+            targets = self.targets[adj.flat]
+            if ins and outs:
+                # the node that owns each slot, to determine the other end of each edge
+                owners = np.repeat(
+                    np.arange(self.number_of_nodes, dtype=sources.dtype),
+                    np.diff(adj.splits),
+                )
+                neighbours = np.where(sources == owners, targets, sources)
+            elif ins:
+                neighbours = sources
+            else:
+                neighbours = targets
+
+            neighbours_dict = NeighbourAdjacencyList(
+                neighbours, self.weights[adj.flat], adj.splits
+            )
+            self._neighbours_dicts[key] = neighbours_dict
+
+        return neighbours_dict
+
+    def invalid_weight_ilocs(self) -> np.ndarray:
+        """
+        Return the integer locations of the edges with a weight that is negative or not finite.
+        This is computed once and then cached.
+        """
+        if self._invalid_weight_ilocs is None:
+            (self._invalid_weight_ilocs,) = np.where(
+                (self.weights < 0) | ~np.isfinite(self.weights)
+            )
+        return self._invalid_weight_ilocs
+
+    def weights_are_uniform(self) -> bool:
+        """
+        Return whether every edge has the same positive weight (trivially true if there are no
+        edges). This is computed once and then cached.
+        """
+        if self._weights_are_uniform is None:
+            weights = self.weights
+            self._weights_are_uniform = bool(
+                len(weights) == 0 or (weights[0] > 0 and (weights == weights[0]).all())
+            )
+        return self._weights_are_uniform
+
     def degrees(self, *, ins=True, outs=True):
         """
         Compute the degrees of every non-isolated node.
@@ -1836,6 +1836,25 @@ class StellarGraph:
 
         return triples
 
+    def _neighbour_lookup(self, *, ins=True, outs=True):
+        """
+        Obtains the neighbours of every node as a single cached adjacency structure, for walks and
+        samplers that visit many nodes.
+
+        Args:
+            ins (bool): follow incoming edges (ignored for undirected graphs)
+            outs (bool): follow outgoing edges (ignored for undirected graphs)
+
+        Returns:
+            A ``NeighbourAdjacencyList`` indexed by :ref:`node iloc <iloc-explanation>`, giving
+            the neighbour ilocs and edge weights of each node.
+        """
+        if not self.is_directed():
+            # all edges are both incoming and outgoing for undirected graphs
+            ins = outs = True
+
+        return self._edges.neighbour_lookup(ins=ins, outs=outs)
+
     def _edge_weights(
         self, source_node: Any, target_node: Any, use_ilocs=False
     ) -> List[Any]:
@@ -27,18 +27,48 @@ __all__ = [
 
 import numpy as np
 import warnings
-from collections import defaultdict, deque
-from scipy import stats
-from scipy.special import softmax
+from collections import defaultdict, OrderedDict
+from scipy.special import betainc
 
 from ..core.schema import GraphSchema
 from ..core.graph import StellarGraph
+from ..core.element_data import NeighbourAdjacencyList
 from ..core.utils import is_real_iterable
 from ..core.validation import require_integer_in_range, comma_sep
-from ..random import random_state
+from ..random import random_state, random_generator
 from abc import ABC, abstractmethod
 
 
+def _node_ilocs_to_id_walks(graph, walks):
+    """
+    Convert a list of walks of node ilocs into a list of walks of node IDs.
+
+    The walks are computed entirely with ilocs, and so all of them are converted with a single
+    lookup, rather than one lookup per walk.
+    """
+    if len(walks) == 0:
+        return []
+
+    ids = graph.node_ilocs_to_ids(np.concatenate(walks))
+    splits = np.cumsum([len(walk) for walk in walks[:-1]])
+    return [list(walk) for walk in np.split(ids, splits)]
+
+
+def _uniform_offsets(np_rs, bounds, size=None):
+    """
+    Draw integers uniformly from ``[0, bound)`` for each element of ``bounds`` (broadcast to
+    ``size``), by scaling a uniform float by the bound and truncating.
+
+    This avoids the per-element rejection loop of ``Generator.integers`` with an array of
+    bounds, and is several times faster. For ``u < 1``, ``floor(u * bound) < bound`` always
+    holds, and the bias from the 53 bits of ``u`` is negligible for any node degree. A bound
+    of 0 gives 0, so callers must mask out nodes without neighbours.
+    """
+    if size is None:
+        size = np.shape(bounds)
+    return (np_rs.random(size) * bounds).astype(np.int64)
+
+
 def _default_if_none(value, default, name, ensure_not_none=True):
     value = value if value is not None else default
     if ensure_not_none and value is None:
@@ -60,7 +90,8 @@ class RandomWalk(ABC):
             raise TypeError("Graph must be a StellarGraph or StellarDiGraph.")
 
         self.graph = graph
-        self._random_state, self._np_random_state = random_state(seed)
+        self._random_state = random_state(seed).random
+        self._np_random_state = random_generator(seed)
 
     def _get_random_state(self, seed):
         """
@@ -68,14 +99,14 @@ class RandomWalk(ABC):
             seed: The optional seed value for a given run.
 
         Returns:
-            The random state as determined by the seed.
+            The Python random state and the NumPy ``Generator``, as determined by the seed.
         """
         if seed is None:
             # Restore the random state
             return self._random_state, self._np_random_state
         # seed the random number generator
         require_integer_in_range(seed, "seed", min_val=0)
-        return random_state(seed)
+        return random_state(seed).random, random_generator(seed)
 
     @staticmethod
     def _validate_walk_params(nodes, n, length):
@@ -106,7 +137,8 @@ class GraphWalk(object):
 
         # Initialize the random state
         self._check_seed(seed)
-        self._random_state, self._np_random_state = random_state(seed)
+        self._random_state = random_state(seed).random
+        self._np_random_state = random_generator(seed)
 
         # We require a StellarGraph for this
         if not isinstance(graph, StellarGraph):
@@ -127,11 +159,34 @@ class GraphWalk(object):
         adj = getattr(self, "adj_types", None)
         if not adj:
             # Create a dict of adjacency lists per edge type, for faster neighbour sampling from graph in SampledHeteroBFS:
-            self.adj_types = adj = self.graph._adjacency_types(
-                self.graph_schema, use_ilocs=True
-            )
+            adj_lists = self.graph._adjacency_types(self.graph_schema, use_ilocs=True)
+            # store the lists for each edge type as a single flat lookup, so that the neighbours of
+            # many nodes can be sampled at once by fancy-indexing
+            self.adj_types = adj = defaultdict(self._empty_neighbour_lookup)
+            for edge_type, adj_et in adj_lists.items():
+                adj[edge_type] = self._to_neighbour_lookup(adj_et)
         return adj
 
+    def _to_neighbour_lookup(self, neighbours_by_node):
+        num_nodes = self.graph.number_of_nodes()
+        iloc_dtype = self.graph._edges.sources.dtype
+
+        lengths = np.zeros(num_nodes, dtype=np.int64)
+        owners = np.fromiter(neighbours_by_node.keys(), dtype=np.int64)
+        lengths[owners] = [len(ns) for ns in neighbours_by_node.values()]
+
+        # the neighbours need to be laid out in iloc order, to match the splits
+        order = np.argsort(owners, kind="stable")
+        lists = list(neighbours_by_node.values())
+        neighbours = np.fromiter(
+            (n for i in order for n in lists[i]), dtype=iloc_dtype, count=lengths.sum()
+        )
+        splits = np.concatenate([[0], np.cumsum(lengths)])
+        return NeighbourAdjacencyList(neighbours, np.ones(len(neighbours)), splits)
+
+    def _empty_neighbour_lookup(self):
+        return self._to_neighbour_lookup({})
+
     def _check_seed(self, seed):
         if seed is not None:
             if type(seed) != int:
@@ -149,16 +204,17 @@ class GraphWalk(object):
             seed: The optional seed value for a given run.
 
         Returns:
-            The random state as determined by the seed.
+            The Python random state and the NumPy ``Generator``, as determined by the seed.
         """
         if seed is None:
             # Use the class's random state
             return self._random_state, self._np_random_state
         # seed the random number generators
-        return random_state(seed)
+        return random_state(seed).random, random_generator(seed)
 
     def neighbors(self, node):
-        return self.graph.neighbor_arrays(node, use_ilocs=True)
+        # a read-only view of the graph's cached neighbours, rather than a fresh array per call
+        return self.graph._neighbour_lookup()[node]
 
     def run(self, *args, **kwargs):
         """
@@ -227,40 +283,109 @@ class GraphWalk(object):
         if len(n_size) == 0:
             # Technically, length 0 should be okay, but by consensus it is invalid.
             self._raise_error("The neighbourhood size list should not be empty.")
+
         for d in n_size:
             if type(d) != int or d < 0:
                 self._raise_error(err_msg)
 
-    def _sample_neighbours_untyped(
-        self, neigh_func, py_and_np_rs, cur_node, size, weighted
-    ):
+    def _sample_neighbours_batch(self, adj, py_and_np_rs, nodes, size, weighted):
         """
-        Sample ``size`` neighbours of ``cur_node`` without checking node types or edge types, optionally
-        using edge weights.
+        Sample ``size`` neighbours of each node in the array ``nodes`` from the graph's cached
+        neighbour lookup ``adj``, without checking node types or edge types, optionally using
+        edge weights.
+
+        Returns:
+            A numpy array of shape ``(len(nodes), size)``, where the row for a node without
+            neighbours (or with the sentinel iloc -1) is filled with -1.
         """
-        if cur_node != -1:
-            neighbours = neigh_func(
-                cur_node, use_ilocs=True, include_edge_weight=weighted
-            )
+        # the -1 sentinel (from a dead end at the previous hop) is treated as a node with no
+        # neighbours, and every node is sampled without branching on whether it has neighbours:
+        # those that don't are given valid (but meaningless) positions and masked out with -1
+        # afterwards
+        valid = nodes >= 0
+        if len(adj.neighbours) == 0 or size == 0 or not valid.any():
+            # there's nothing to sample: no edges at all, or every node is already a dead end (which
+            # is common deep in a sample, since a dead end's whole subtree is also dead ends)
+            return np.full((len(nodes), size), -1, dtype=adj.sample_dtype)
+
+        safe_nodes = np.where(valid, nodes, 0)
+        degrees = np.where(valid, adj.lengths[safe_nodes], 0)[:, None]
+        starts = adj.starts[safe_nodes].astype(np.int64)[:, None]
+        last = len(adj.neighbours) - 1
 
-            if weighted:
-                neighbours, weights = neighbours
+        if weighted:
+            # sample following the edge weights, for all the nodes at once: each draw is a binary
+            # search for a random threshold in the running total of the weights of its node
+            # (excluding the last boundary, so a threshold that rounds up to the total still chooses
+            # the last neighbour)
+            cumulative = adj.cumulative_weights()
+            lo = np.minimum(starts, last)
+            hi = np.where(degrees > 0, starts + degrees - 1, lo)
+            totals = np.where(degrees > 0, cumulative[hi], 0)
+            thresholds = py_and_np_rs[1].random((len(nodes), size)) * totals
+
+            lo = np.repeat(lo, size, axis=1)
+            hi = np.repeat(hi, size, axis=1)
+            searching = lo < hi
+            while searching.any():
+                mid = (lo + hi) // 2
+                right = cumulative[mid] <= thresholds
+                lo = np.where(searching & right, mid + 1, lo)
+                hi = np.where(searching & ~right, mid, hi)
+                searching = lo < hi
+
+            # nodes with all weights 0 have nothing to choose
+            idx = lo
+            has_choice = totals > 0
         else:
-            neighbours = []
+            # uniform sample, with replacement, for all the nodes at once
+            offsets = _uniform_offsets(py_and_np_rs[1], degrees, (len(nodes), size))
+            idx = np.minimum(starts + offsets, last)
+            has_choice = degrees > 0
 
-        if len(neighbours) > 0:
-            if weighted:
-                # sample following the edge weights
-                idx = naive_weighted_choices(py_and_np_rs[1], weights, size=size)
-                if idx is not None:
-                    return neighbours[idx]
-            else:
-                # uniform sample; for small-to-moderate `size`s (< 100 is typical for GraphSAGE), random
-                # has less overhead than np.random
-                return np.array(py_and_np_rs[0].choices(neighbours, k=size))
+        sampled = adj.neighbours[idx].astype(adj.sample_dtype)
+        return np.where(has_choice, sampled, -1)
+
+
+def _uniform_walks(graph, nodes, n, length, np_rs):
+    """
+    Perform ``n`` uniform random walks of at most ``length`` nodes from each of the root node ilocs
+    ``nodes``, using the NumPy ``Generator`` ``np_rs``.
+
+    Returns:
+        List of lists of nodes ids for each of the random walks
+    """
+    adj = graph._neighbour_lookup()
+    last = len(adj.neighbours) - 1
+
+    # for each root node, do n walks
+    current = np.repeat(nodes, n)
+
+    # All of the walks are done together, one step at a time, with each step taken by every
+    # walk that hasn't reached a dead end. Walks that have stopped are masked out, and still
+    # get (meaningless) positions, so that the arrays never need to be compacted.
+    walks = np.empty((len(current), length), dtype=current.dtype)
+    walks[:, 0] = current
+    walk_lengths = np.ones(len(current), dtype=int)
+    walking = np.ones(len(current), dtype=bool)
+
+    for step in range(1, length):
+        degrees = adj.lengths[current]
+        walking &= degrees > 0
+        if last < 0 or not walking.any():
+            # every walk is at a dead end, so stop
+            break
 
-        # no neighbours (e.g. isolated node, cur_node == -1 or all weights 0), so propagate the -1 sentinel
-        return np.full(size, -1)
+        # has neighbours, so pick one to walk to
+        offsets = _uniform_offsets(np_rs, degrees)
+        next_nodes = adj.neighbours[np.minimum(adj.starts[current] + offsets, last)]
+        current = np.where(walking, next_nodes, current)
+
+        walks[:, step] = current
+        walk_lengths += walking
+
+    ids = graph.node_ilocs_to_ids(walks[:, : walk_lengths.max(initial=1)])
+    return [list(walk[:walk_length]) for walk, walk_length in zip(ids, walk_lengths)]
 
 
 class UniformRandomWalk(RandomWalk):
@@ -305,50 +430,87 @@ class UniformRandomWalk(RandomWalk):
         n = _default_if_none(n, self.n, "n")
         length = _default_if_none(length, self.length, "length")
         self._validate_walk_params(nodes, n, length)
-        rs, _ = self._get_random_state(seed)
+        _, np_rs = self._get_random_state(seed)
 
-        nodes = self.graph.node_ids_to_ilocs(nodes)
+        return _uniform_walks(
+            self.graph, self.graph.node_ids_to_ilocs(nodes), n, length, np_rs
+        )
 
-        # for each root node, do n walks
-        return [self._walk(rs, node, length) for node in nodes for _ in range(n)]
 
-    def _walk(self, rs, start_node, length):
-        walk = [start_node]
-        current_node = start_node
-        for _ in range(length - 1):
-            neighbours = self.graph.neighbor_arrays(current_node, use_ilocs=True)
-            if len(neighbours) == 0:
-                # dead end, so stop
-                break
-            else:
-                # has neighbours, so pick one to walk to
-                current_node = rs.choice(neighbours)
-            walk.append(current_node)
+def _node2vec_transition_weights(
+    neighbours, weights, previous_node, previous_node_neighbours, ip, iq
+):
+    """
+    Scale the edge weights from the current node of a second order (node2vec) random walk to each
+    of its ``neighbours``, to give the unnormalised transition probabilities for the next step.
 
-        return list(self.graph.node_ilocs_to_ids(walk))
+    Args:
+        neighbours (numpy.ndarray): the neighbours of the current node
+        weights (numpy.ndarray): the weights of the edges to each neighbour, updated in place
+        previous_node: the node visited before the current node, or None at the start of the walk
+        previous_node_neighbours (numpy.ndarray): the neighbours of ``previous_node``
+        ip (float): 1/p, the bias for returning to ``previous_node``
+        iq (float): 1/q, the bias for moving to a node that is not a neighbour of ``previous_node``
+
+    Returns:
+        The ``weights`` array.
+    """
+    mask = neighbours == previous_node
+    weights[mask] *= ip
+    if len(previous_node_neighbours) > 0:
+        # a binary search for each neighbour in the sorted neighbours of the previous node, which
+        # is much faster than np.isin for the small arrays in a single step
+        sorted_neighbours = np.sort(previous_node_neighbours)
+        positions = np.searchsorted(sorted_neighbours, neighbours)
+        np.minimum(positions, len(sorted_neighbours) - 1, out=positions)
+        mask |= sorted_neighbours[positions] == neighbours
+    weights[~mask] *= iq
+    return weights
+
+
+def _alias_table(weights):
+    """
+    Build a table for sampling indices with probability proportional to the non-negative
+    ``weights`` (which must have a positive sum) in constant time, using Vose's alias method.
 
+    An index is sampled by choosing ``i`` uniformly, and then keeping it with probability
+    ``probs[i]``, or otherwise choosing ``aliases[i]``.
 
-def naive_weighted_choices(rs, weights, size=None):
+    Returns:
+        A tuple of the ``probs`` and ``aliases`` lists (lists, because they're indexed one element
+        at a time, which is much faster than indexing numpy arrays).
     """
-    Select indices at random, weighted by the iterator `weights` of
-    arbitrary (non-negative) floats. That is, `x` will be returned
-    with probability `weights[x]/sum(weights)`.
-
-    For doing a single sample with arbitrary weights, this is much (5x
-    or more) faster than numpy.random.choice, because the latter
-    requires a lot of preprocessing (normalized probabilties), and
-    does a lot of conversions/checks/preprocessing internally.
-    """
-    probs = np.cumsum(weights)
-    total = probs[-1]
-    if total == 0:
-        # all weights were zero (probably), so we shouldn't choose anything
-        return None
+    count = len(weights)
+    probs = (weights * (count / weights.sum())).tolist()
+    aliases = list(range(count))
+
+    small = [i for i, prob in enumerate(probs) if prob < 1]
+    large = [i for i, prob in enumerate(probs) if prob >= 1]
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+
+        # the remainder of `less`'s column is filled by `more`
+        aliases[less] = more
+        probs[more] += probs[less] - 1
+        if probs[more] < 1:
+            small.append(more)
+        else:
+            large.append(more)
+
+    # anything left over is within rounding error of 1
+    for i in small + large:
+        probs[i] = 1.0
+
+    return probs, aliases
 
-    thresholds = rs.random() if size is None else rs.random(size)
-    idx = np.searchsorted(probs, thresholds * total, side="left")
 
-    return idx
+# the approximate number of bytes of alias tables BiasedRandomWalk keeps cached during a run
+_BIASED_WALK_TABLE_BYTES = 2 ** 26
+# the approximate size of a cached alias table: a fixed cost for the cache entry, its key and the
+# table's containers, plus the boxed probability and alias stored for each neighbour
+_BIASED_WALK_TABLE_OVERHEAD_BYTES = 512
+_BIASED_WALK_TABLE_ENTRY_BYTES = 64
 
 
 class BiasedRandomWalk(RandomWalk):
@@ -390,23 +552,18 @@ class BiasedRandomWalk(RandomWalk):
         self.p = p
         self.q = q
         self.weighted = weighted
-        self._checked_weights = False
 
         if weighted:
             self._check_weights_valid()
 
     def _check_weights_valid(self):
-        if self._checked_weights:
-            # we only need to check the weights once, either in the constructor or in run, whichever
-            # sets `weighted=True` first
-            return
-
-        # Check that all edge weights are greater than or equal to 0.
-        source, target, _, weights = self.graph.edge_arrays(
-            include_edge_weight=True, use_ilocs=True
-        )
-        (invalid,) = np.where((weights < 0) | ~np.isfinite(weights))
+        # Check that all edge weights are greater than or equal to 0. The scan over every edge is
+        # cached by the graph, so this is cheap for every walker and run after the first.
+        invalid = self.graph._edges.invalid_weight_ilocs()
         if len(invalid) > 0:
+            source, target, _, weights = self.graph.edge_arrays(
+                include_edge_weight=True, use_ilocs=True
+            )
 
             def format(idx):
                 s = source[idx]
@@ -418,8 +575,6 @@ class BiasedRandomWalk(RandomWalk):
                 f"graph: expected all edge weights to be non-negative and finite, found some negative or infinite: {comma_sep(invalid, stringify=format)}"
             )
 
-        self._checked_weights = True
-
     def run(
         self, nodes, *, n=None, length=None, p=None, q=None, seed=None, weighted=None
     ):
@@ -448,7 +603,7 @@ class BiasedRandomWalk(RandomWalk):
         weighted = _default_if_none(weighted, self.weighted, "weighted")
         self._validate_walk_params(nodes, n, length)
         self._check_weights(p, q, weighted)
-        rs, _ = self._get_random_state(seed)
+        rs, np_rs = self._get_random_state(seed)
 
         nodes = self.graph.node_ids_to_ilocs(nodes)
 
@@ -469,50 +624,110 @@ class BiasedRandomWalk(RandomWalk):
                 f"q: value ({q}) is too small. It must be possible to represent 1/q in {weight_dtype}, but this value overflows to infinity."
             )
 
+        # with p = q = 1, there's no bias, and so the walk is first order: the next node doesn't
+        # depend on the previous one
+        first_order = ip == 1 and iq == 1
+        if first_order and self._weights_are_uniform(weighted):
+            # and if every edge also has the same weight, every neighbour is equally likely, and the
+            # (much faster) uniform walk samples from exactly the same distribution
+            return _uniform_walks(self.graph, nodes, n, length, np_rs)
+
+        adj = self.graph._neighbour_lookup()
+
+        def transition_table(previous_node, current_node):
+            neighbours = adj[current_node]
+            if len(neighbours) == 0:
+                return None
+
+            if weighted:
+                # copy, because the transition weighting updates it in place
+                weights = adj.weights_of(current_node).copy()
+            else:
+                weights = np.ones(neighbours.shape, dtype=weight_dtype)
+
+            if previous_node is None:
+                previous_node_neighbours = []
+            else:
+                previous_node_neighbours = adj[previous_node]
+
+            _node2vec_transition_weights(
+                neighbours, weights, previous_node, previous_node_neighbours, ip, iq,
+            )
+            if weights.sum() == 0:
+                # all weights were zero (probably), so we shouldn't choose anything
+                return None
+
+            probs, aliases = _alias_table(weights)
+            return int(adj.starts[current_node]), probs, aliases
+
+        def table_bytes(table):
+            # a dead end has no table, but its cache entry still takes space
+            entries = 0 if table is None else len(table[1])
+            return (
+                _BIASED_WALK_TABLE_OVERHEAD_BYTES
+                + entries * _BIASED_WALK_TABLE_ENTRY_BYTES
+            )
+
+        # The transition probabilities from a node depend only on the node visited before it, so
+        # the alias table for each (previous, current) pair is built on the first step across it,
+        # and then reused for every later one, making each of those steps constant time. The tables
+        # for every pair can hold up to the sum of the squared degrees in total, so the least
+        # recently used ones are evicted once they take more than about _BIASED_WALK_TABLE_BYTES.
+        tables = OrderedDict()
+        cached_bytes = 0
+        flat_neighbours = adj.neighbours
+
         walks = []
-        for node in nodes:  # iterate over root nodes
+        for node in nodes.tolist():  # iterate over root nodes
             for walk_number in range(n):  # generate n walks per root node
                 # the walk starts at the root
                 walk = [node]
 
                 previous_node = None
-                previous_node_neighbours = []
-
                 current_node = node
 
                 for _ in range(length - 1):
                     # select one of the neighbours using the
                     # appropriate transition probabilities
-                    if weighted:
-                        neighbours, weights = self.graph.neighbor_arrays(
-                            current_node, include_edge_weight=True, use_ilocs=True
-                        )
+                    if first_order:
+                        # the transition probabilities are the same whatever the previous node
+                        key = (None, current_node)
                     else:
-                        neighbours = self.graph.neighbor_arrays(
-                            current_node, use_ilocs=True
-                        )
-                        weights = np.ones(neighbours.shape, dtype=weight_dtype)
-                    if len(neighbours) == 0:
-                        break
-
-                    mask = neighbours == previous_node
-                    weights[mask] *= ip
-                    mask |= np.isin(neighbours, previous_node_neighbours)
-                    weights[~mask] *= iq
+                        key = (previous_node, current_node)
+                    if key in tables:
+                        tables.move_to_end(key)
+                        table = tables[key]
+                    else:
+                        table = tables[key] = transition_table(*key)
+                        cached_bytes += table_bytes(table)
+                        while cached_bytes > _BIASED_WALK_TABLE_BYTES:
+                            _, evicted = tables.popitem(last=False)
+                            cached_bytes -= table_bytes(evicted)
 
-                    choice = naive_weighted_choices(rs, weights)
-                    if choice is None:
+                    if table is None:
                         break
 
+                    start, probs, aliases = table
+                    choice = rs.randrange(len(probs))
+                    if rs.random() >= probs[choice]:
+                        choice = aliases[choice]
+
                     previous_node = current_node
-                    previous_node_neighbours = neighbours
-                    current_node = neighbours[choice]
+                    current_node = int(flat_neighbours[start + choice])
 
                     walk.append(current_node)
 
-                walks.append(list(self.graph.node_ilocs_to_ids(walk)))
+                walks.append(walk)
 
-        return walks
+        return _node_ilocs_to_id_walks(self.graph, walks)
+
+    def _weights_are_uniform(self, weighted):
+        """
+        Whether the walk chooses between the neighbours of every node uniformly (ignoring the
+        node2vec bias): either it's unweighted, or every edge has the same positive weight.
+        """
+        # the scan over every edge weight is cached by the graph
+        return not weighted or self.graph._edges.weights_are_uniform()
 
     def _check_weights(self, p, q, weighted):
         """
@@ -596,11 +811,27 @@ class UniformRandomMetaPathWalk(RandomWalk):
 
         nodes = self.graph.node_ids_to_ilocs(nodes)
 
+        adj = self.graph._neighbour_lookup()
+        node_type_ilocs = self.graph._nodes.type_ilocs
+        # compare types by iloc, so that neighbours can be filtered without converting their types
+        # to names (a type that isn't in the graph becomes -1, which matches no node)
+        metapaths = [
+            self.graph._nodes.types.to_iloc(metapath, smaller_type=False).tolist()
+            for metapath in metapaths
+        ]
+
+        # The neighbours of each node that have a given type, computed on the first step that needs
+        # them, and then shared by every later walk that reaches that node at that point in a
+        # metapath.
+        typed_neighbours = {}
+
+        def neighbours_of_type(node, node_type):
+            neighbours = adj[node]
+            return neighbours[node_type_ilocs[neighbours] == node_type].tolist()
+
         walks = []
 
-        for node in nodes:
-            # retrieve node type
-            label = self.graph.node_type(node, use_ilocs=True)
+        for node, label in zip(nodes.tolist(), node_type_ilocs[nodes].tolist()):
             filtered_metapaths = [
                 metapath
                 for metapath in metapaths
@@ -623,32 +854,21 @@ class UniformRandomMetaPathWalk(RandomWalk):
                     for d in range(length):
                         walk.append(current_node)
                         # d+1 can also be used to index metapath to retrieve the node type for the next step in the walk
-                        neighbours = self.graph.neighbor_arrays(
-                            current_node, use_ilocs=True
-                        )
-                        # filter these by node type
-                        neighbour_types = self.graph.node_type(
-                            neighbours, use_ilocs=True
-                        )
-                        neighbours = [
-                            neigh
-                            for neigh, neigh_type in zip(neighbours, neighbour_types)
-                            if neigh_type == metapath[d]
-                        ]
-
-                        if len(neighbours) == 0:
+                        key = (current_node, metapath[d])
+                        candidates = typed_neighbours.get(key)
+                        if candidates is None:
+                            candidates = neighbours_of_type(*key)
+                            typed_neighbours[key] = candidates
+
+                        if len(candidates) == 0:
                             # if no neighbours of the required type as dictated by the metapath exist, then stop.
                             break
                         # select one of the neighbours uniformly at random
-                        current_node = rs.choice(
-                            neighbours
-                        )  # the next node in the walk
+                        current_node = candidates[rs.randrange(len(candidates))]
 
-                    walks.append(
-                        list(self.graph.node_ilocs_to_ids(walk))
-                    )  # store the walk
+                    walks.append(walk)  # store the walk
 
-        return walks
+        return _node_ilocs_to_id_walks(self.graph, walks)
 
     def _check_metapath_values(self, metapaths):
         """
@@ -708,43 +928,29 @@ class SampledBreadthFirstWalk(GraphWalk):
         self._check_sizes(n_size)
         self._check_common_parameters(nodes, n, len(n_size), seed)
         py_and_np_rs = self._get_random_state(seed)
+        adj = self.graph._neighbour_lookup()
+
+        roots = np.repeat(np.asarray(nodes, dtype=np.int64), n)
+
+        # All of the walks are done together, one hop at a time, and written into a single array
+        # with a row for each walk. The nodes at each depth occupy a contiguous block of columns,
+        # where consecutive groups of `size` columns are the neighbours sampled from a single node
+        # at the previous depth, in order, so that each row is a walk in breadth-first order.
+        widths = np.cumprod([1] + n_size)
+        ends = np.cumsum(widths)
+        walks = np.empty((len(roots), ends[-1]), dtype=adj.sample_dtype)
+        walks[:, 0] = roots
+
+        for depth, size in enumerate(n_size):
+            parents = walks[:, ends[depth] - widths[depth] : ends[depth]]
+            sampled = self._sample_neighbours_batch(
+                adj, py_and_np_rs, parents.ravel(), size, weighted
+            )
+            walks[:, ends[depth] : ends[depth + 1]] = sampled.reshape(
+                len(roots), widths[depth + 1]
+            )
 
-        walks = []
-        max_hops = len(n_size)  # depth of search
-
-        for node in nodes:  # iterate over root nodes
-            for _ in range(n):  # do n bounded breadth first walks from each root node
-                q = deque()  # the queue of neighbours
-                walk = list()  # the list of nodes in the subgraph of node
-                # extend() needs iterable as parameter; we use list of tuples (node id, depth)
-                q.append((node, 0))
-
-                while len(q) > 0:
-                    # remove the top element in the queue
-                    # index 0 pop the item from the front of the list
-                    cur_node, cur_depth = q.popleft()
-                    depth = cur_depth + 1  # the depth of the neighbouring nodes
-                    walk.append(cur_node)  # add to the walk
-
-                    # consider the subgraph up to and including max_hops from root node
-                    if depth > max_hops:
-                        continue
-
-                    neighbours = self._sample_neighbours_untyped(
-                        self.graph.neighbor_arrays,
-                        py_and_np_rs,
-                        cur_node,
-                        n_size[cur_depth],
-                        weighted,
-                    )
-
-                    # add them to the back of the queue
-                    q.extend((sampled_node, depth) for sampled_node in neighbours)
-
-                # finished i-th walk from node so add it to the list of walks as a list
-                walks.append(walk)
-
-        return walks
+        return walks.tolist()
 
 
 class SampledHeterogeneousBreadthFirstWalk(GraphWalk):
@@ -771,63 +977,66 @@ class SampledHeterogeneousBreadthFirstWalk(GraphWalk):
         """
         self._check_sizes(n_size)
         self._check_common_parameters(nodes, n, len(n_size), seed)
-        rs, _ = self._get_random_state(seed)
+        py_and_np_rs = self._get_random_state(seed)
 
         adj = self.get_adjacency_types()
-
-        walks = []
-        d = len(n_size)  # depth of search
-
-        for node in nodes:  # iterate over root nodes
-            for _ in range(n):  # do n bounded breadth first walks from each root node
-                q = list()  # the queue of neighbours
-                walk = list()  # the list of nodes in the subgraph of node
-
-                # Start the walk by adding the head node, and node type to the frontier list q
-                node_type = self.graph.node_type(node, use_ilocs=True)
-                q.extend([(node, node_type, 0)])
-
-                # add the root node to the walks
-                walk.append([node])
-                while len(q) > 0:
-                    # remove the top element in the queue and pop the item from the front of the list
-                    frontier = q.pop(0)
-                    current_node, current_node_type, depth = frontier
-                    depth = depth + 1  # the depth of the neighbouring nodes
-
-                    # consider the subgraph up to and including depth d from root node
-                    if depth <= d:
-                        # Find edge types for current node type
-                        current_edge_types = self.graph_schema.schema[current_node_type]
-
-                        # Create samples of neigbhours for all edge types
-                        for et in current_edge_types:
-                            neigh_et = adj[et][current_node]
-
-                            # If there are no neighbours of this type then we return None
-                            # in the place of the nodes that would have been sampled
-                            # YT update: with the new way to get neigh_et from adj[et][current_node], len(neigh_et) is always > 0.
-                            # In case of no neighbours of the current node for et, neigh_et == [None],
-                            # and samples automatically becomes [None]*n_size[depth-1]
-                            if len(neigh_et) > 0:
-                                samples = rs.choices(neigh_et, k=n_size[depth - 1])
-                            else:  # this doesn't happen anymore, see the comment above
-                                _size = n_size[depth - 1]
-                                samples = [-1] * _size
-
-                            walk.append(samples)
-                            q.extend(
-                                [
-                                    (sampled_node, et.n2, depth)
-                                    for sampled_node in samples
-                                ]
-                            )
-
-                # finished i-th walk from node so add it to the list of walks as a list
-                walks.append(walk)
+        roots = np.repeat(np.asarray(nodes, dtype=np.int64), n)
+        root_types = self.graph.node_type(roots, use_ilocs=True)
+
+        walks = [None] * len(roots)
+        # The layout of a walk (the sequence of edge types sampled along, and so the sizes of each
+        # list) depends only on the type of its root, so all the roots of one type are walked
+        # together, one hop at a time, with every list sampled for all of them at once.
+        for root_type in np.unique(root_types):
+            (rows,) = np.nonzero(root_types == root_type)
+            type_walks = self._walk_from_roots(
+                adj, py_and_np_rs, roots[rows], root_type, n_size
+            )
+            for row, walk in zip(rows, type_walks):
+                walks[row] = walk
 
         return walks
 
+    def _walk_from_roots(self, adj, py_and_np_rs, roots, root_type, n_size):
+        """
+        Performs the sampled breadth-first walks for an array of roots that all have the type
+        ``root_type``.
+
+        Returns:
+            A list of walks, each of which is a list of lists of node ilocs.
+        """
+        sample_dtype = np.promote_types(roots.dtype, np.int8)
+        # each element is one list of every walk, as a (roots, size) array
+        samples = [roots[:, None].astype(sample_dtype)]
+        # the lists sampled at the previous hop, with the type of their nodes, in walk order
+        frontier = [(root_type, samples[0])]
+
+        for size in n_size:
+            next_frontier = []
+            for node_type, parents in frontier:
+                edge_types = self.graph_schema.schema[node_type]
+                # sample for every parent node at once for each edge type...
+                by_edge_type = [
+                    self._sample_neighbours_batch(
+                        adj[et], py_and_np_rs, parents.ravel(), size, weighted=False
+                    ).reshape(parents.shape + (size,))
+                    for et in edge_types
+                ]
+                # ...but the lists are ordered by parent node first, then edge type, as a queue
+                # of nodes would visit them
+                for col in range(parents.shape[1]):
+                    for et, sampled in zip(edge_types, by_edge_type):
+                        samples.append(sampled[:, col, :])
+                        next_frontier.append((et.n2, sampled[:, col, :]))
+
+            frontier = next_frontier
+
+        widths = [sample.shape[1] for sample in samples]
+        ends = np.cumsum(widths)
+        bounds = list(zip(ends - widths, ends))
+        flat = np.concatenate(samples, axis=1).tolist()
+        return [[walk[start:end] for start, end in bounds] for walk in flat]
+
 
 class DirectedBreadthFirstNeighbours(GraphWalk):
     """
@@ -872,66 +1081,59 @@ class DirectedBreadthFirstNeighbours(GraphWalk):
         self._check_neighbourhood_sizes(in_size, out_size)
         self._check_common_parameters(nodes, n, len(in_size), seed)
         py_and_np_rs = self._get_random_state(seed)
+        # the adjacency and sizes for each direction, indexed by 0 for in-nodes and 1 for out-nodes
+        direction_adjs = (
+            self.graph._neighbour_lookup(outs=False),
+            self.graph._neighbour_lookup(ins=False),
+        )
+        direction_sizes = (in_size, out_size)
 
         max_hops = len(in_size)
         # A binary tree is a graph of nodes; however, we wish to avoid overusing the term 'node'.
         # Consider that each binary tree node carries some information.
         # We uniquely and deterministically number every node in the tree, so we
         # can represent the information stored in the tree via a flattened list of 'slots'.
-        # Each slot (and corresponding binary tree node) now has a unique index in the flattened list.
+        # Each slot (and corresponding binary tree node) now has a unique index in the flattened list,
+        # with the nodes sampled from slot i in direction d (0 or 1) being in slot 2i + 1 + d.
         max_slots = 2 ** (max_hops + 1) - 1
+        roots = np.repeat(np.asarray(nodes, dtype=np.int64), n)
+
+        # All of the samples are done together, one slot at a time, and written into a single
+        # array with a row for each sample. Each slot occupies a contiguous block of columns, where
+        # consecutive groups of columns are the neighbours sampled from a single node in the
+        # parent slot, in order.
+        children = []
+        widths = [1]
+        for slot in range(1, max_slots):
+            parent, direction = divmod(slot - 1, 2)
+            depth = (parent + 1).bit_length() - 1
+            size = direction_sizes[direction][depth]
+            children.append((slot, parent, direction, size))
+            widths.append(widths[parent] * size)
+
+        ends = np.cumsum(widths).tolist()
+        bounds = [(end - width, end) for end, width in zip(ends, widths)]
+        samples = np.empty(
+            (len(roots), ends[-1]), dtype=direction_adjs[0].sample_dtype
+        )
+        samples[:, 0] = roots
+
+        for slot, parent, direction, size in children:
+            parent_start, parent_end = bounds[parent]
+            start, end = bounds[slot]
+
+            sampled = self._sample_neighbours_batch(
+                direction_adjs[direction],
+                py_and_np_rs,
+                samples[:, parent_start:parent_end].ravel(),
+                size,
+                weighted,
+            )
+            samples[:, start:end] = sampled.reshape(len(roots), end - start)
 
-        samples = []
-
-        for node in nodes:  # iterate over root nodes
-            for _ in range(n):  # do n bounded breadth first walks from each root node
-                q = list()  # the queue of neighbours
-                # the list of sampled node-lists:
-                sample = [[] for _ in range(max_slots)]
-                # Add node to queue as (node, depth, slot)
-                q.append((node, 0, 0))
-
-                while len(q) > 0:
-                    # remove the top element in the queue
-                    # index 0 pop the item from the front of the list
-                    cur_node, cur_depth, cur_slot = q.pop(0)
-                    sample[cur_slot].append(cur_node)  # add to the walk
-                    depth = cur_depth + 1  # the depth of the neighbouring nodes
-
-                    # consider the subgraph up to and including max_hops from root node
-                    if depth > max_hops:
-                        continue
-                    # get in-nodes
-                    neighbours = self._sample_neighbours_untyped(
-                        self.graph.in_node_arrays,
-                        py_and_np_rs,
-                        cur_node,
-                        in_size[cur_depth],
-                        weighted,
-                    )
-                    # add them to the back of the queue
-                    slot = 2 * cur_slot + 1
-                    q.extend(
-                        [(sampled_node, depth, slot) for sampled_node in neighbours]
-                    )
-                    # get out-nodes
-                    neighbours = self._sample_neighbours_untyped(
-                        self.graph.out_node_arrays,
-                        py_and_np_rs,
-                        cur_node,
-                        out_size[cur_depth],
-                        weighted,
-                    )
-                    # add them to the back of the queue
-                    slot = slot + 1
-                    q.extend(
-                        [(sampled_node, depth, slot) for sampled_node in neighbours]
-                    )
-
-                # finished multi-hop neighbourhood sampling
-                samples.append(sample)
-
-        return samples
+        return [
+            [sample[start:end] for start, end in bounds] for sample in samples.tolist()
+        ]
 
     def _check_neighbourhood_sizes(self, in_size, out_size):
         """
@@ -952,6 +1154,10 @@ class DirectedBreadthFirstNeighbours(GraphWalk):
             )
 
 
+# how many initial edges TemporalRandomWalk draws at once
+_INITIAL_EDGE_BATCH_SIZE = 1024
+
+
 class TemporalRandomWalk(GraphWalk):
     """
     Performs temporal random walks on the given graph. The graph should contain numerical edge
@@ -1009,6 +1215,9 @@ class TemporalRandomWalk(GraphWalk):
         self.initial_edge_bias = initial_edge_bias
         self.walk_bias = walk_bias
         self.p_walk_success_threshold = p_walk_success_threshold
+        # initial edge bias type -> (sources, targets, times, cumulative biases), reused by every
+        # call to run
+        self._initial_edges_cache = {}
 
     def run(
         self,
@@ -1089,10 +1298,28 @@ class TemporalRandomWalk(GraphWalk):
         walks = []
         num_cw_curr = 0
 
-        sources, targets, _, times = self.graph.edge_arrays(include_edge_weight=True)
-        edge_biases = self._temporal_biases(
-            times, None, bias_type=initial_edge_bias, is_forward=False,
+        sources, targets, times, edge_cumulative = self._initial_edges(
+            initial_edge_bias
         )
+        if edge_cumulative is not None:
+            edge_total = edge_cumulative[-1]
+            edge_thresholds = edge_cumulative[:-1]
+
+        def initial_edges():
+            # drawing the initial edges one at a time has a lot of per-call overhead, so they're
+            # drawn in batches, and a new batch is only drawn once the previous one is used up
+            while True:
+                if edge_cumulative is None:
+                    batch = np_rs.integers(len(times), size=_INITIAL_EDGE_BATCH_SIZE)
+                else:
+                    # a binary search for a random threshold in the running total of the weights
+                    # (excluding the last boundary)
+                    batch = np.searchsorted(
+                        edge_thresholds,
+                        np_rs.random(_INITIAL_EDGE_BATCH_SIZE) * edge_total,
+                        side="right",
+                    )
+                yield from batch
 
         successes = 0
         failures = 0
@@ -1100,13 +1327,19 @@ class TemporalRandomWalk(GraphWalk):
         def not_progressing_enough():
             # Estimate the probability p of a walk being long enough; the 95% percentile is used to
             # be more stable with respect to randomness. This uses Beta(1, 1) as the prior, since
-            # it's uniform on p
-            posterior = stats.beta.ppf(0.95, 1 + successes, 1 + failures)
-            return posterior < p_walk_success_threshold
+            # it's uniform on p. The percentile is below the threshold exactly when more than 95%
+            # of the posterior is below it, and evaluating the CDF directly with betainc is much
+            # cheaper than inverting it with stats.beta.ppf on every failure.
+            posterior_below = betainc(
+                1 + successes, 1 + failures, p_walk_success_threshold
+            )
+            return posterior_below > 0.95
+
+        first_edge_indices = initial_edges()
 
         # loop runs until we have enough context windows in total
         while num_cw_curr < num_cw:
-            first_edge_index = self._sample(len(times), edge_biases, np_rs)
+            first_edge_index = next(first_edge_indices)
             src = sources[first_edge_index]
             dst = targets[first_edge_index]
             t = times[first_edge_index]
@@ -1129,18 +1362,58 @@ class TemporalRandomWalk(GraphWalk):
                         f"Consider using a smaller context window size (currently cw_size={cw_size})."
                     )
 
-        return walks
+        return _node_ilocs_to_id_walks(self.graph, walks)
+
+    def _initial_edges(self, bias_type):
+        """
+        The source, target and time of every edge, along with the cumulative biases for choosing
+        an initial edge (or None for uniform sampling).
 
-    def _sample(self, n, biases, np_rs):
-        if biases is not None:
-            assert len(biases) == n
-            return naive_weighted_choices(np_rs, biases)
+        Every initial edge is drawn from the same distribution, so these are computed once per bias
+        type and reused by each walk and each call to ``run``.
+        """
+        cached = self._initial_edges_cache.get(bias_type)
+        if cached is None:
+            sources, targets, _, times = self.graph.edge_arrays(
+                include_edge_weight=True, use_ilocs=True
+            )
+            biases = self._temporal_biases(
+                times, None, bias_type=bias_type, is_forward=False,
+            )
+            cumulative = None if biases is None else np.cumsum(biases)
+            cached = (sources, targets, times, cumulative)
+            self._initial_edges_cache[bias_type] = cached
+
+        return cached
+
+    def _sample_step(self, candidate_times, time, bias_type, np_rs):
+        if bias_type is None:
+            # default to uniform random sampling
+            return np_rs.integers(len(candidate_times))
+
+        if bias_type == "exponential":
+            # Exponential decay means candidate i has log-weight time - candidate_times[i] (up to a
+            # constant), so the Gumbel-max trick samples it exactly as the argmax of the log-weights
+            # plus Gumbel noise. Unlike a softmax, this needs no exp, normalisation or cumulative
+            # sum, which dominate for the short neighbourhoods typical of a temporal step.
+            gaps = candidate_times - time
+            return np.argmax(np_rs.gumbel(size=len(gaps)) - gaps)
         else:
-            return np_rs.choice(n)
+            raise ValueError("Unsupported bias type")
 
     def _exp_biases(self, times, t_0, decay):
         # t_0 assumed to be smaller than all time values
-        return softmax(t_0 - np.array(times) if decay else np.array(times) - t_0)
+        if decay:
+            biases = np.subtract(t_0, times, dtype=np.float64)
+        else:
+            biases = np.subtract(times, t_0, dtype=np.float64)
+
+        # a softmax, computed in place: shifting the exponents so that the largest is 0 avoids
+        # overflow, and doesn't change the normalised result
+        biases -= biases.max()
+        np.exp(biases, out=biases)
+        biases /= biases.sum()
+        return biases
 
     def _temporal_biases(self, times, time, bias_type, is_forward):
         if bias_type is None:
@@ -1161,31 +1434,41 @@ class TemporalRandomWalk(GraphWalk):
         Perform 1 temporal step from a node. Returns None if a dead-end is reached.
 
         """
-        neighbours, times = self.graph.neighbor_arrays(node, include_edge_weight=True)
-        neighbours = neighbours[times > time]
-        times = times[times > time]
-
-        if len(neighbours) > 0:
-            biases = self._temporal_biases(times, time, bias_type, is_forward=True)
-            chosen_neighbour_index = self._sample(len(neighbours), biases, np_rs)
-            assert chosen_neighbour_index is not None, "biases should never be all zero"
+        # each node's edges are sorted by time, so the edges that continue forward in time are the
+        # ones after a binary search for the current time
+        adj = self.graph._neighbour_lookup().sorted_by_weight()
+        times = adj.weights_of(node)
+        first = np.searchsorted(times, time, side="right")
+
+        if first < len(times):
+            candidate_times = times[first:]
+            chosen_candidate = self._sample_step(
+                candidate_times, time, bias_type, np_rs
+            )
 
-            next_node = neighbours[chosen_neighbour_index]
+            chosen_neighbour_index = first + chosen_candidate
+            next_node = adj[node][chosen_neighbour_index]
             next_time = times[chosen_neighbour_index]
             return next_node, next_time
         else:
             return None
 
     def _walk(self, src, dst, t, length, bias_type, np_rs):
-        walk = [src, dst]
+        # the walk is at most length long, so it's written into an array of that size, which is
+        # then cheap to concatenate with the others when converting to node IDs
+        walk = np.empty(length, dtype=np.int64)
+        walk[0] = src
+        walk[1] = dst
+        walk_length = 2
         node, time = dst, t
         for _ in range(length - 2):
             result = self._step(node, time=time, bias_type=bias_type, np_rs=np_rs)
 
             if result is not None:
                 node, time = result
-                walk.append(node)
+                walk[walk_length] = node
+                walk_length += 1
             else:
                 break
 
-        return walk
+        return walk[:walk_length]
@@ -148,11 +148,26 @@ class DatasetLoader:
 
     def _missing_files(self) -> List[str]:
         """Returns a list of files that are missing"""
-        return [
-            file
-            for file in self.expected_files
-            if not os.path.isfile(self._resolve_path(file))
-        ]
+        # list each directory once, rather than checking every expected file separately
+        present_files = {}
+        missing = []
+        for file in self.expected_files:
+            path = self._resolve_path(file)
+            directory, name = os.path.split(path)
+            if directory not in present_files:
+                try:
+                    with os.scandir(directory) as entries:
+                        present_files[directory] = {
+                            entry.name for entry in entries if entry.is_file()
+                        }
+                except OSError:
+                    # a missing (or unreadable) directory has none of its files
+                    present_files[directory] = set()
+
+            if name not in present_files[directory]:
+                missing.append(file)
+
+        return missing
 
     def _is_downloaded(self) -> bool:
         """Returns true if the expected files for the dataset are present"""
@@ -262,6 +262,18 @@ class PubMedDiabetes(
         return StellarGraph({"paper": nodes}, {"cites": edgelist}), labels
 
 
+def _prefixed_ids(prefix, ids):
+    """
+    Convert the Series of integer IDs ``ids`` to strings starting with ``prefix``.
+
+    Each distinct ID is only converted once, and every occurrence of it shares that string, rather
+    than an edge list creating a new string for every row.
+    """
+    codes, uniques = pd.factorize(ids)
+    names = (prefix + uniques.astype(str)).to_numpy()
+    return pd.Series(names[codes], index=ids.index, name=ids.name)
+
+
 class BlogCatalog3(
     DatasetLoader,
     name="BlogCatalog3",
@@ -304,26 +316,31 @@ class BlogCatalog3(
             self._resolve_path(name) for name in self.expected_files
         ]
 
-        user_node_ids = pd.read_csv(nodes, header=None)
-        group_ids = pd.read_csv(groups, header=None)
-        edges = pd.read_csv(edges, header=None, names=["source", "target"])
-        group_edges = pd.read_csv(group_edges, header=None, names=["source", "target"])
+        # every file is just integer IDs, so tell the parser rather than having it infer the types
+        user_node_ids = pd.read_csv(nodes, header=None, dtype=np.int32)
+        group_ids = pd.read_csv(groups, header=None, dtype=np.int32)
+        edges = pd.read_csv(
+            edges, header=None, names=["source", "target"], dtype=np.int32
+        )
+        group_edges = pd.read_csv(
+            group_edges, header=None, names=["source", "target"], dtype=np.int32
+        )
 
         # The dataset uses integers for node ids. However, the integers from 1 to 39 are used as IDs
         # for both users and groups. This is disambiguated by converting everything to strings and
         # prepending u to user IDs, and g to group IDs.
         def u(users):
-            return "u" + users.astype(str)
+            return _prefixed_ids("u", users)
 
         def g(groups):
-            return "g" + groups.astype(str)
+            return _prefixed_ids("g", groups)
 
         # nodes:
-        user_node_ids = u(user_node_ids)
-        group_ids = g(group_ids)
+        user_node_ids = user_node_ids.apply(u)
+        group_ids = group_ids.apply(g)
 
         # node IDs in each edge:
-        edges = u(edges)
+        edges = edges.apply(u)
         group_edges["source"] = u(group_edges["source"])
         group_edges["target"] = g(group_edges["target"])
 
@@ -333,7 +350,7 @@ class BlogCatalog3(
         group_ids.set_index(0, inplace=True)
 
         start = len(edges)
-        group_edges.index = range(start, start + len(group_edges))
+        group_edges.index = pd.RangeIndex(start, start + len(group_edges))
 
         return StellarGraph(
             nodes={"user": user_node_ids, "group": group_ids},
@@ -314,7 +314,7 @@ class APPNP:
             Ainput = [
                 SqueezedSparseConversion(
                     shape=(n_nodes, n_nodes), dtype=A_values.dtype
-                )([A_indices, A_values])
+                )([A_indices, A_values, x_in])
             ]
 
         # Otherwise, create dense matrix from input tensor
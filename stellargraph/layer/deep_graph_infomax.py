@@ -40,7 +40,7 @@ class DGIDiscriminator(Layer):
     def build(self, input_shapes):
 
         first_size = input_shapes[0][-1]
-        second_size = input_shapes[1][-1]
+        second_size = input_shapes[-1][-1]
 
         self.kernel = self.add_weight(
             shape=(first_size, second_size),
@@ -59,15 +59,24 @@ class DGIDiscriminator(Layer):
             inputs: a list or tuple of tensors with shapes ``[(1, N, F), (1, F)]`` for full batch methods and shapes
                 ``[(B, F), (F,)]`` for sampled node methods, containing the node features and a summary feature vector.
                 Where ``N`` is the number of nodes in the graph, ``F`` is the feature dimension, and ``B`` is the batch size.
+                More than one node features tensor can be given before the summary, to score each of them against
+                the same summary.
         Returns:
-            a Tensor with shape ``(1, N)`` for full batch methods and shape ``(B,)`` for sampled node methods.
+            a Tensor with shape ``(1, N)`` for full batch methods and shape ``(B,)`` for sampled node methods, or a
+            list of such Tensors (one for each node features tensor) if there are more than one.
         """
 
-        features, summary = inputs
+        *all_features, summary = inputs
 
-        score = tf.linalg.matvec(features, tf.linalg.matvec(self.kernel, summary),)
+        # the summary is projected by the kernel once, and shared by every node features tensor
+        projected_summary = tf.linalg.matvec(self.kernel, summary)
+        scores = [
+            tf.linalg.matvec(features, projected_summary) for features in all_features
+        ]
 
-        return score
+        if len(scores) == 1:
+            return scores[0]
+        return scores
 
 
 class DGIReadout(Layer):
@@ -186,8 +195,9 @@ class DeepGraphInfomax:
 
         summary = DGIReadout()(node_feats)
 
-        scores = self._discriminator([node_feats, summary])
-        scores_corrupted = self._discriminator([node_feats_corr, summary])
+        scores, scores_corrupted = self._discriminator(
+            [node_feats, node_feats_corr, summary]
+        )
 
         x_out = tf.stack([scores, scores_corrupted], axis=-1)
 
@@ -190,8 +190,20 @@ class GraphConvolution(Layer):
         """
         features, *As = inputs
 
-        # Calculate the layer operation of GCN
         A = As[0]
+        if A.dtype != features.dtype:
+            # a layer with a different compute dtype (such as float16 or bfloat16 with a mixed
+            # precision policy) has its features and kernel in that dtype, so the adjacency matrix
+            # needs to match, whether it's dense or sparse
+            A = tf.cast(A, features.dtype)
+
+        # Calculate the layer operation of GCN, A X W. Matrix multiplication is associative, so
+        # when the layer shrinks the features (units < F), (X W) is computed first, so that the
+        # multiplication by the adjacency matrix works with the narrower N x units matrix.
+        transform_first = self.units < self.kernel.shape[0]
+        if transform_first:
+            features = K.dot(features, self.kernel)
+
         if K.is_sparse(A):
             # FIXME(#1222): batch_dot doesn't support sparse tensors, so we special case them to
             # only work with a single batch element (and the adjacency matrix without a batch
@@ -210,11 +222,15 @@ class GraphConvolution(Layer):
             h_graph = K.expand_dims(h_graph, axis=0)
         else:
             h_graph = K.batch_dot(A, features)
-        output = K.dot(h_graph, self.kernel)
+
+        if transform_first:
+            output = h_graph
+        else:
+            output = K.dot(h_graph, self.kernel)
 
         # Add optional bias & apply activation
         if self.bias is not None:
-            output += self.bias
+            output = K.bias_add(output, self.bias)
         output = self.activation(output)
 
         return output
@@ -412,7 +428,7 @@ class GCN:
             Ainput = [
                 SqueezedSparseConversion(
                     shape=(n_nodes, n_nodes), dtype=A_values.dtype
-                )([A_indices, A_values])
+                )([A_indices, A_values, x_in])
             ]
         else:
             Ainput = As
@@ -483,7 +483,7 @@ class GraphAttentionSparse(GraphAttention):
 
             # Convert to sparse matrix
             sparse_attn = tf.sparse.SparseTensor(
-                A_indices, values=dropout_attn, dense_shape=[n_nodes, n_nodes]
+                A_indices, values=dropout_attn, dense_shape=A_sparse.dense_shape
             )
 
             # Apply softmax to get attention coefficients
@@ -857,7 +857,7 @@ class GAT:
             A_indices, A_values = As
             Ainput = [
                 SqueezedSparseConversion(shape=(n_nodes, n_nodes))(
-                    [A_indices, A_values]
+                    [A_indices, A_values, x_in]
                 )
             ]
 
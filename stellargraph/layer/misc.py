@@ -36,7 +36,9 @@ class SqueezedSparseConversion(Layer):
         ```
 
     Args:
-        shape (list of int): The shape of the sparse matrix to create
+        shape (list of int): The shape of the sparse matrix to create. Dimensions that are only
+            known when the model runs (such as the number of nodes in a Cluster-GCN mini-batch)
+            can be None, and are then the number of nodes in the node features input.
         dtype (str or tf.dtypes.DType): Data type for the created sparse matrix
     """
 
@@ -70,7 +72,9 @@ class SqueezedSparseConversion(Layer):
             inputs (list): Two input tensors contining
                 matrix indices (size 1 x E x 2) of type int64, and
                 matrix values (size (size 1 x E),
-                where E is the number of non-zero entries in the matrix.
+                where E is the number of non-zero entries in the matrix,
+                optionally followed by the node features (size 1 x N x F), which are required
+                if the shape has any None dimensions.
 
         Returns:
             TensorFlow SparseTensor that represents the converted sparse matrix.
@@ -90,9 +94,18 @@ class SqueezedSparseConversion(Layer):
         # tensorflow installed.
         import tensorflow as tf
 
+        dense_shape = self.matrix_shape
+        if any(dim is None for dim in dense_shape):
+            if len(inputs) < 3:
+                raise ValueError(
+                    f"inputs: expected node features as the third input to determine the unknown dimensions of shape {self.matrix_shape}, found {len(inputs)} inputs"
+                )
+            num_nodes = tf.shape(inputs[2], out_type=tf.int64)[-2]
+            dense_shape = [num_nodes if dim is None else dim for dim in dense_shape]
+
         # Build sparse tensor for the matrix
         output = tf.SparseTensor(
-            indices=indices, values=values, dense_shape=self.matrix_shape
+            indices=indices, values=values, dense_shape=dense_shape
         )
         return output
 
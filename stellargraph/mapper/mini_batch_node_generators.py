@@ -26,7 +26,7 @@ import numpy as np
 import networkx as nx
 from tensorflow.keras.utils import Sequence
 
-from scipy import sparse
+import scipy.sparse as sps
 from ..core.graph import StellarGraph
 from ..core.utils import is_real_iterable, normalize_adj
 from ..connector.neo4j.graph import Neo4jStellarGraph
@@ -69,9 +69,15 @@ class ClusterNodeGenerator(Generator):
         weighted (bool, optional): if True, use the edge weights from ``G``; if False, treat the
             graph as unweighted.
         name (str, optional): Name for the node generator.
+        sparse (bool, optional): If True, the adjacency matrix of each mini-batch is supplied to
+            the model as a sparse matrix (its indices and values), which avoids the memory and
+            computation of dense N x N matrices for large clusters. If False (default), it is
+            supplied as a dense matrix.
     """
 
-    def __init__(self, G, clusters=1, q=1, lam=0.1, weighted=False, name=None):
+    def __init__(
+        self, G, clusters=1, q=1, lam=0.1, weighted=False, name=None, sparse=False
+    ):
 
         if not isinstance(G, (StellarGraph, Neo4jStellarGraph)):
             raise TypeError("Graph must be a StellarGraph or StellarDiGraph object.")
@@ -83,7 +89,7 @@ class ClusterNodeGenerator(Generator):
         self.clusters = clusters
         self.method = "cluster_gcn"
         self.multiplicity = 1
-        self.use_sparse = False
+        self.use_sparse = sparse
         self.weighted = weighted
 
         if isinstance(clusters, list):
@@ -203,6 +209,7 @@ class ClusterNodeGenerator(Generator):
             q=self.q,
             lam=self.lam,
             weighted=self.weighted,
+            sparse=self.use_sparse,
             name=name,
         )
 
@@ -233,6 +240,10 @@ class ClusterNodeSequence(Sequence):
             1 such that the generator treats each subgraph as a batch.
         lam (float, optional): The mixture coefficient for adjacency matrix normalisation (the
             'diagonal enhancement' method). Valid values are in the interval [0, 1] and the default value is 0.1.
+        weighted (bool, optional): if True, use the edge weights from ``graph``; if False, treat the
+            graph as unweighted.
+        sparse (bool, optional): If True, supply the adjacency matrix of each batch as its indices
+            (size 1 x E x 2) and values (size 1 x E), instead of a dense matrix (size 1 x N x N).
         name (str, optional): An optional name for this generator object.
     """
 
@@ -246,6 +257,7 @@ class ClusterNodeSequence(Sequence):
         q=1,
         lam=0.1,
         weighted=False,
+        sparse=False,
         name=None,
     ):
 
@@ -258,6 +270,7 @@ class ClusterNodeSequence(Sequence):
         self.q = q
         self.lam = lam
         self.weighted = weighted
+        self.use_sparse = sparse
         self.node_order = list()
         self._node_order_in_progress = list()
         self.__node_buffer = dict()
@@ -311,15 +324,13 @@ class ClusterNodeSequence(Sequence):
         normalization = 1 / (degrees + 1)
 
         # NA: multiply rows manually
-        norm_adj = adj_cluster.multiply(normalization[:, None]).toarray()
+        norm_adj = adj_cluster.multiply(normalization[:, None])
 
-        # λN(diag(A) + (1 + 1/λ)I): work with the diagonals directly
-        diag = np.diag(norm_adj)
+        # λN(diag(A) + (1 + 1/λ)I): work with the diagonals directly, keeping the result sparse
         diag_addition = (
             normalization * self.lam * (adj_cluster.diagonal() + (1 + 1 / self.lam))
         )
-        np.fill_diagonal(norm_adj, diag + diag_addition)
-        return norm_adj
+        return norm_adj + sps.diags(diag_addition)
 
     def __getitem__(self, index):
         # The next batch should be the adjacency matrix for the cluster and the corresponding feature vectors
@@ -329,8 +340,6 @@ class ClusterNodeSequence(Sequence):
 
         if self.normalize_adj:
             adj_cluster = self._diagonal_enhanced_normalization(adj_cluster)
-        else:
-            adj_cluster = adj_cluster.toarray()
 
         g_node_list = list(cluster)
 
@@ -368,10 +377,24 @@ class ClusterNodeSequence(Sequence):
         features = self.graph.node_features(g_node_list)
 
         features = np.reshape(features, (1,) + features.shape)
-        adj_cluster = adj_cluster.reshape((1,) + adj_cluster.shape)
         target_node_indices = target_node_indices[np.newaxis, :]
 
-        return [features, target_node_indices, adj_cluster], cluster_targets
+        if self.use_sparse:
+            # going via CSR puts the entries in row-major (canonical) order, without duplicates:
+            # some TensorFlow sparse operations (like the softmax in GAT) require this, and it
+            # gives the sparse-dense multiplications good locality
+            adj_cluster = adj_cluster.tocsr()
+            adj_cluster.sort_indices()
+            adj_cluster = adj_cluster.tocoo()
+            adj_indices = np.column_stack((adj_cluster.row, adj_cluster.col))
+            adj_inputs = [
+                adj_indices[np.newaxis, ...].astype("int64"),
+                adj_cluster.data[np.newaxis, :],
+            ]
+        else:
+            adj_inputs = [adj_cluster.toarray()[np.newaxis, ...]]
+
+        return [features, target_node_indices, *adj_inputs], cluster_targets
 
     def __node_buffer_dict_to_list(self):
         self.node_order = []
@@ -57,6 +57,24 @@ def random_state(seed):
         return _seeded_state(seed)
 
 
+def random_generator(seed):
+    """
+    Create a NumPy ``Generator`` (using the PCG64 bit generator) from the provided seed. If seed is
+    None, the generator is seeded from the global RandomState, so that it is still controlled by
+    :func:`set_seed`.
+
+    Args:
+        seed (int, optional): random seed
+
+    Returns:
+        numpy.random.Generator object
+    """
+    if seed is None:
+        seed = _rs.random.randrange(2 ** 32)
+
+    return np_rn.default_rng(seed)
+
+
 def set_seed(seed):
     """
     Create a new global RandomState using the provided seed. If seed is None, StellarGraph's global
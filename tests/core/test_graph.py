@@ -1230,6 +1230,50 @@ def test_neighbors_unweighted_hom(is_directed, use_ilocs):
     )
 
 
+@pytest.mark.parametrize("is_directed", [True, False])
+def test_neighbour_lookup(is_directed):
+    graph = example_weighted_hin(is_directed=is_directed)
+
+    methods = [
+        ({}, graph.neighbor_arrays),
+        ({"outs": False}, graph.in_node_arrays),
+        ({"ins": False}, graph.out_node_arrays),
+    ]
+    for kwargs, method in methods:
+        adj = graph._neighbour_lookup(**kwargs)
+        # cached
+        assert graph._neighbour_lookup(**kwargs) is adj
+
+        for node in range(graph.number_of_nodes()):
+            expected_nodes, expected_weights = method(
+                node, include_edge_weight=True, use_ilocs=True
+            )
+            assert adj.lengths[node] == len(expected_nodes)
+            # views into the shared cache, which must not be modifiable
+            for arr in [adj[node], adj.weights_of(node)]:
+                assert isinstance(arr, np.ndarray)
+                assert not arr.flags.writeable
+
+            start = adj.starts[node]
+            np.testing.assert_array_equal(
+                adj.cumulative_weights()[start : start + adj.lengths[node]],
+                np.cumsum(adj.weights_of(node)),
+            )
+            assert_items_equal(
+                zip(adj[node], adj.weights_of(node)),
+                zip(expected_nodes, expected_weights),
+            )
+
+        sorted_adj = adj.sorted_by_weight()
+        assert adj.sorted_by_weight() is sorted_adj
+        for node in range(graph.number_of_nodes()):
+            weights = sorted_adj.weights_of(node)
+            assert (np.diff(weights) >= 0).all()
+            assert_items_equal(
+                zip(sorted_adj[node], weights), zip(adj[node], adj.weights_of(node)),
+            )
+
+
 @pytest.mark.parametrize("use_ilocs", [True, False])
 def test_undirected_hin_neighbor_methods(use_ilocs):
     graph = example_weighted_hin(is_directed=False)
@@ -18,7 +18,7 @@ import numpy as np
 import pandas as pd
 import pytest
 import networkx as nx
-from stellargraph.data.explorer import BiasedRandomWalk
+from stellargraph.data.explorer import BiasedRandomWalk, _alias_table
 from stellargraph.core.graph import StellarGraph
 from ..test_utils.graphs import create_test_graph, example_graph_random
 
@@ -554,3 +554,75 @@ class TestBiasedRandomWalk(object):
         length = 5
 
         benchmark(lambda: biasedrw.run(nodes=nodes, n=n, p=p, q=q, length=length))
+
+
+@pytest.mark.parametrize(
+    "weights", [[1.0], [1.0, 1.0, 1.0], [0.0, 3.0, 1.0, 0.5], [0.1, 7.0, 0.0, 2.0, 2.0]]
+)
+def test_alias_table(weights):
+    weights = np.array(weights)
+    probs, aliases = _alias_table(weights)
+
+    assert len(probs) == len(aliases) == len(weights)
+    assert all(0 <= prob <= 1 for prob in probs)
+
+    # the probability of sampling each index: being chosen uniformly and kept, or being the alias
+    # of an index that was chosen and not kept
+    implied = np.array(probs)
+    np.add.at(implied, aliases, 1 - np.array(probs))
+    implied /= len(weights)
+
+    np.testing.assert_allclose(implied, weights / weights.sum())
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_walk_first_order(weighted):
+    # with p = q = 1, the next step doesn't depend on the previous node
+    g = create_test_weighted_graph()
+    biasedrw = BiasedRandomWalk(g, n=5, length=10, weighted=weighted, seed=1)
+
+    nodes = list(g.nodes())
+    walks = biasedrw.run(nodes)
+    assert len(walks) == 5 * len(nodes)
+
+    for walk in walks:
+        for source, target in zip(walk, walk[1:]):
+            assert target in g.neighbors(source)
+
+        if walk[0] == "loner":
+            assert len(walk) == 1
+        elif walk[0] == "self loner":
+            # the only edge has weight 0, and so can't be followed in a weighted walk
+            assert len(walk) == (1 if weighted else 10)
+        else:
+            assert len(walk) == 10
+
+
+def test_evicted_tables_sample_the_same_walks(monkeypatch):
+    g = example_graph_random(n_nodes=20, n_edges=60)
+    nodes = list(g.nodes())
+
+    def walks():
+        return BiasedRandomWalk(g).run(nodes=nodes, n=3, length=10, p=2, q=3, seed=42)
+
+    expected = walks()
+    # the alias tables don't consume any randomness, so rebuilding them after they're evicted
+    # doesn't change the walks
+    monkeypatch.setattr("stellargraph.data.explorer._BIASED_WALK_TABLE_BYTES", 1)
+    assert walks() == expected
+
+
+
+def test_walk_first_order_uniform_weights_scanned_once(monkeypatch):
+    g = example_graph_random(n_nodes=20, n_edges=60)
+    nodes = list(g.nodes())
+    biasedrw = BiasedRandomWalk(g, n=2, length=5, weighted=True)
+
+    biasedrw.run(nodes, seed=1)
+    assert g._edges.weights_are_uniform()
+
+    # the uniformity of the weights is cached after the first run, so a later run doesn't read
+    # (and thus doesn't rescan) the weights at all
+    monkeypatch.setattr(g._edges, "weights", None)
+    walks = biasedrw.run(nodes, seed=1)
+    assert len(walks) == 2 * len(nodes)
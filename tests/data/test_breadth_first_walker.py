@@ -99,6 +99,24 @@ class TestBreadthFirstWalk(object):
         subgraph = bfw.run(nodes=nodes, n=n, n_size=n_size)
         assert len(subgraph) == 0
 
+    def test_parameter_checking_repeated(self):
+        g = create_test_graph()
+        bfw = SampledBreadthFirstWalk(g)
+        nodes = g.node_ids_to_ilocs(["0", 1])
+
+        bfw.run(nodes=nodes, n=1, n_size=[1], seed=1)
+        bfw.run(nodes=nodes, n=1, n_size=[1], seed=1)
+
+        # parameters that compare equal to the previous valid ones are still checked
+        with pytest.raises(ValueError):
+            bfw.run(nodes=nodes, n=True, n_size=[1], seed=1)
+        with pytest.raises(ValueError):
+            bfw.run(nodes=nodes, n=1.0, n_size=[1], seed=1)
+        with pytest.raises(ValueError):
+            bfw.run(nodes=nodes, n=1, n_size=[1], seed=1.0)
+        with pytest.raises(ValueError):
+            bfw.run(nodes=None, n=1, n_size=[1], seed=1)
+
     def test_walk_generation_single_root_node_loner(self):
         g = create_test_graph()
         bfw = SampledBreadthFirstWalk(g)
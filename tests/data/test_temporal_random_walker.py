@@ -83,6 +83,28 @@ def test_exp_biases_extreme(temporal_graph):
     assert sum(biases) == pytest.approx(1)
 
 
+@pytest.mark.parametrize("time", [0, 100000])
+def test_sample_step_exponential(temporal_graph, time):
+    rw = TemporalRandomWalk(temporal_graph)
+    rs = np.random.default_rng(0)
+    candidate_times = time + np.array([1.0, 1.5, 3.0])
+
+    n = 20000
+    counts = np.bincount(
+        [rw._sample_step(candidate_times, time, "exponential", rs) for _ in range(n)],
+        minlength=3,
+    )
+    expected = rw._exp_biases(candidate_times, time, decay=True)
+    np.testing.assert_allclose(counts / n, expected, atol=0.02)
+
+
+def test_sample_step_unsupported(temporal_graph):
+    rw = TemporalRandomWalk(temporal_graph)
+    rs = np.random.default_rng(0)
+    with pytest.raises(ValueError, match="Unsupported bias type"):
+        rw._sample_step(np.array([1.0]), 0, "foo", rs)
+
+
 @pytest.mark.parametrize("cw_size", [-1, 1, 2, 4])
 def test_cw_size_and_walk_length(temporal_graph, cw_size):
     rw = TemporalRandomWalk(temporal_graph)
@@ -23,9 +23,10 @@ import pytest
 
 
 @pytest.mark.parametrize("model_type", [APPNP, GAT, GCN])
-def test_fullbatch_cluster_models(model_type):
+@pytest.mark.parametrize("sparse", [False, True])
+def test_fullbatch_cluster_models(model_type, sparse):
     G = example_graph_random(n_nodes=50)
-    generator = ClusterNodeGenerator(G, clusters=10)
+    generator = ClusterNodeGenerator(G, clusters=10, sparse=sparse)
     nodes = G.nodes()[:40]
     gen = generator.flow(nodes, targets=np.ones(len(nodes)))
 
@@ -171,3 +171,27 @@ def test_dgi_save_load(tmpdir, model_type):
     infomax = DeepGraphInfomax(base_model, corrupted_generator)
 
     test_utils.model_save_load(tmpdir, infomax)
+
+
+@pytest.mark.parametrize("full_batch", [False, True])
+def test_dgi_discriminator_multiple_features(full_batch):
+    rs = np.random.RandomState(0)
+    if full_batch:
+        features = rs.random_sample((1, 5, 3))
+        corrupted = rs.random_sample((1, 5, 3))
+        summary = rs.random_sample((1, 3))
+    else:
+        features = rs.random_sample((5, 3))
+        corrupted = rs.random_sample((5, 3))
+        summary = rs.random_sample(3)
+
+    discriminator = DGIDiscriminator(dtype="float64")
+    scores, scores_corrupted = discriminator([features, corrupted, summary])
+
+    # scoring several features against a summary is the same as scoring each one separately
+    np.testing.assert_allclose(scores, discriminator([features, summary]))
+    np.testing.assert_allclose(scores_corrupted, discriminator([corrupted, summary]))
+
+    kernel = discriminator.kernel.numpy()
+    expected = np.einsum("...nf,fg,...g->...n", features, kernel, summary)
+    np.testing.assert_allclose(scores, expected)
@@ -132,6 +132,61 @@ def test_GraphConvolution_sparse():
         GraphConvolution(2)([x_t, A_mat])
 
 
+@pytest.mark.parametrize("units", [1, 3])
+@pytest.mark.parametrize("sparse", [False, True])
+def test_GraphConvolution_matmul_order(units, sparse):
+    # the features have dimension 2, so units = 1 multiplies by the kernel first, and units = 3
+    # multiplies by the adjacency matrix first; both should compute A X W
+    G, features = create_graph_features()
+    n_nodes = features.shape[0]
+    adj = G.to_adjacency_matrix()
+
+    x_t = Input(batch_shape=(1,) + features.shape)
+    layer = GraphConvolution(units, bias_initializer="ones")
+    if sparse:
+        A_ind = Input(batch_shape=(1, None, 2), dtype="int64")
+        A_val = Input(batch_shape=(1, None), dtype="float32")
+        A_mat = SqueezedSparseConversion(shape=(n_nodes, n_nodes))([A_ind, A_val])
+        model = keras.Model(inputs=[x_t, A_ind, A_val], outputs=layer([x_t, A_mat]))
+
+        adj_coo = adj.tocoo()
+        A_indices = np.column_stack((adj_coo.row, adj_coo.col))[None, ...]
+        adj_inputs = [A_indices.astype(np.int64), adj_coo.data[None, :]]
+    else:
+        A_t = Input(batch_shape=(1, n_nodes, n_nodes))
+        model = keras.Model(inputs=[x_t, A_t], outputs=layer([x_t, A_t]))
+        adj_inputs = [adj.toarray()[None, ...]]
+
+    preds = model.predict([features[None, ...]] + adj_inputs, batch_size=1)
+
+    kernel = layer.kernel.numpy()
+    expected = adj.toarray() @ features @ kernel + 1
+    np.testing.assert_allclose(preds[0], expected, rtol=1e-5)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_GraphConvolution_dtype(sparse):
+    G, features = create_graph_features()
+    n_nodes = features.shape[0]
+    adj = G.to_adjacency_matrix()
+
+    # the adjacency matrix is float32, and should be converted to the layer's dtype
+    x_t = Input(batch_shape=(1,) + features.shape, dtype="float64")
+    layer = GraphConvolution(2, dtype="float64")
+    if sparse:
+        A_ind = Input(batch_shape=(1, None, 2), dtype="int64")
+        A_val = Input(batch_shape=(1, None), dtype="float32")
+        A_mat = SqueezedSparseConversion(shape=(n_nodes, n_nodes), dtype="float32")(
+            [A_ind, A_val]
+        )
+        out = layer([x_t, A_mat])
+    else:
+        A_t = Input(batch_shape=(1, n_nodes, n_nodes), dtype="float32")
+        out = layer([x_t, A_t])
+
+    assert out.dtype == tf.float64
+
+
 def test_GCN_init():
     G, _ = create_graph_features()
 
@@ -219,6 +219,42 @@ def test_cluster_weighted():
     )
 
 
+@pytest.mark.parametrize("weighted", [False, True])
+def test_cluster_sparse(weighted):
+    G = create_stellargraph()
+
+    dense = ClusterNodeGenerator(
+        G, clusters=[["a", "b", "c"], ["d"]], weighted=weighted
+    )
+    sparse = ClusterNodeGenerator(
+        G, clusters=[["a", "b", "c"], ["d"]], weighted=weighted, sparse=True
+    )
+    assert sparse.use_sparse
+
+    dense_seq = dense.flow(node_ids=["a", "b", "c", "d"])
+    sparse_seq = sparse.flow(node_ids=["a", "b", "c", "d"])
+    assert len(dense_seq) == len(sparse_seq) == 2
+
+    for (dense_inputs, _), (sparse_inputs, _) in zip(dense_seq, sparse_seq):
+        features, target_indices, adj = dense_inputs
+        sparse_features, sparse_target_indices, indices, values = sparse_inputs
+
+        np.testing.assert_array_equal(sparse_features, features)
+        np.testing.assert_array_equal(sparse_target_indices, target_indices)
+
+        n_nodes = features.shape[1]
+        assert indices.shape == (1, values.shape[1], 2)
+        assert indices.dtype == np.int64
+
+        # canonical row-major order
+        flat = indices[0, :, 0] * n_nodes + indices[0, :, 1]
+        assert np.all(np.diff(flat) > 0)
+
+        reconstructed = np.zeros((n_nodes, n_nodes))
+        reconstructed[indices[0, :, 0], indices[0, :, 1]] = values[0]
+        np.testing.assert_allclose(reconstructed, adj[0])
+
+
 @pytest.mark.benchmark(group="ClusterGCN generator")
 @pytest.mark.parametrize("q", [1, 2, 10])
 def test_benchmark_ClusterGCN_generator(benchmark, q):
@@ -14,7 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from stellargraph.random import SeededPerBatch
+from stellargraph.random import SeededPerBatch, random_generator, set_seed
 import numpy as np
 
 
@@ -36,3 +36,17 @@ def test_seeded_per_batch():
         return tuple(batches)
 
     assert len({get_batches(batch_nums) for batch_nums in batch_nums_perms}) == 1
+
+
+def test_random_generator():
+    def draw(seed):
+        return random_generator(seed).integers(1000, size=20)
+
+    np.testing.assert_array_equal(draw(123), draw(123))
+
+    # unseeded generators follow the global seed
+    set_seed(42)
+    first = draw(None)
+    set_seed(42)
+    np.testing.assert_array_equal(draw(None), first)
+    set_seed(None)